@@ -10,13 +10,97 @@ import time
 import signal
 import sys
 import json
-from typing import Optional, Dict, List
+import struct
+import logging
+import logging.handlers
+import functools
+import itertools
+import re
+import queue
+import selectors
+import os
+from typing import Optional, Dict, List, Mapping, Tuple
+from types import MappingProxyType
 from collections import deque
-from datetime import datetime
 
+if sys.platform.startswith('linux'):
+    import fcntl
+elif sys.platform == 'win32':
+    import subprocess
 
-def get_local_ip_addresses():
-    """Get list of local IP addresses that clients can use to connect"""
+# Prefer orjson for parsing inbound messages (C parser, accepts bytes directly),
+# falling back to the standard library when it is not installed
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records while the queue is full instead of blocking or erroring"""
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass  # Console output can't keep up; losing a line beats stalling a receive thread
+
+
+class BlockingStopQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room in a bounded queue to post its sentinel"""
+    
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+# Message output of the socket threads goes through a bounded queue; SocketManager runs the
+# QueueListener that writes it to stdout, keeping console I/O off the receive threads
+LOG_QUEUE_SIZE = 10000
+_log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+logger = logging.getLogger('foxlinx')
+logger.setLevel(logging.INFO)
+logger.addHandler(DroppingQueueHandler(_log_queue))
+logger.propagate = False
+
+# One "key:value" entry of the simple text formats ("k1:v1,k2:v2"), surrounding whitespace
+# excluded; the value runs to the next comma so it may itself contain ':'
+_KV_RE = re.compile(rb'\s*([^,:]*?)\s*:\s*([^,]*?)\s*(?=,|$)')
+
+# The usual real-time message: one device with a quoted value, e.g. {"21001A0012505037":"1195.0"}
+# (no escapes or control characters, so the captured bytes are the JSON strings' contents;
+# only JSON's own whitespace is allowed, unlike \s which also matches \x0b and \x0c)
+_SINGLE_READING_RE = re.compile(rb'[ \t\n\r]*\{[ \t\n\r]*"([^"\\\x00-\x1f]*)"[ \t\n\r]*:[ \t\n\r]*"([^"\\\x00-\x1f]*)"[ \t\n\r]*\}[ \t\n\r]*')
+
+# Rules framing the multi-line console reports
+SEPARATOR = "=" * 60
+DIVIDER = "-" * 60
+
+# Device status icons; the usual spellings are looked up directly, anything else falls back
+# to a case-insensitive comparison (see status_icon)
+_STATUS_ICONS = {'active': '✓', 'Active': '✓', 'ACTIVE': '✓', 'deactive': '✗', 'Deactive': '✗', 'DEACTIVE': '✗'}
+
+HELP_TEXT = "\n".join([
+    "\n" + SEPARATOR,
+    "Available Commands:",
+    "  <command>     - Send command to base board",
+    "  status        - Show connection status of all threads",
+    "  help          - Show this help message",
+    "  exit/quit     - Exit the application",
+    SEPARATOR + "\n",
+])
+# What print(HELP_TEXT) writes, encoded once (the text is ASCII, line endings as the text layer would write them)
+_HELP_BYTES = (HELP_TEXT + "\n").replace("\n", os.linesep).encode('ascii')
+
+# 4-byte big-endian length prefix of the length-prefixed protocol
+_LEN = struct.Struct('>I')
+
+# Local IP discovery: results are reused for this long; Linux ioctl to read an interface address
+IP_CACHE_SECONDS = 30
+_SIOCGIFADDR = 0x8915
+
+
+def _discover_ip_addresses():
+    """Collect local IP addresses that clients can use to connect"""
     ip_addresses = []
     
     # Add localhost
@@ -41,7 +125,21 @@ def get_local_ip_addresses():
     
     # Try to get all network interfaces
     try:
-        import subprocess
+        if sys.platform.startswith('linux'):
+            # Linux: IPv4 address of every interface via ioctl, without spawning a process
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                for _, name in socket.if_nameindex():
+                    try:
+                        ifreq = fcntl.ioctl(s.fileno(), _SIOCGIFADDR, struct.pack('256s', name[:15].encode()))
+                    except OSError:
+                        continue  # Interface without an IPv4 address
+                    ip = socket.inet_ntoa(ifreq[20:24])
+                    if ip not in [known[0] for known in ip_addresses]:
+                        ip_addresses.append((ip, f'interface {name}'))
+            finally:
+                s.close()
+        
         if sys.platform == 'win32':
             # Windows: ipconfig
             result = subprocess.run(['ipconfig'], capture_output=True, text=True, timeout=2)
@@ -58,6 +156,261 @@ def get_local_ip_addresses():
     return ip_addresses
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_ip_addresses(period: int) -> Tuple[Tuple[str, str], ...]:
+    """Discovery result for one cache period (a new period evicts the previous result)"""
+    return tuple(_discover_ip_addresses())
+
+
+def get_local_ip_addresses():
+    """Get list of local IP addresses that clients can use to connect (refreshed every 30 seconds)"""
+    return list(_cached_ip_addresses(int(time.monotonic()) // IP_CACHE_SECONDS))
+
+
+SOCKET_BUFFER_SIZE = 1 << 20  # Requested kernel send/receive buffer size (1 MB)
+RECV_SIZE = 65536  # Bytes read per recv() call on connections without a ConnectionState
+# Report a peer that went away as BrokenPipeError instead of raising SIGPIPE (Linux)
+SEND_FLAGS = getattr(socket, 'MSG_NOSIGNAL', 0)
+
+
+def configure_listen_socket(sock: socket.socket):
+    """Request large kernel buffers on a listening socket (inherited by accepted sockets)"""
+    for option in (socket.SO_RCVBUF, socket.SO_SNDBUF):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, option, SOCKET_BUFFER_SIZE)
+        except OSError:
+            pass
+
+
+def _safe_close(sock: Optional[socket.socket]):
+    """Close a socket if there is one, ignoring errors from an already broken connection"""
+    if sock is None:
+        return
+    try:
+        sock.close()
+    except OSError:
+        pass
+
+
+def create_listen_socket(host: str, port: int, timeout: float) -> socket.socket:
+    """Create the listening socket for one base board connection (closed again if bind/listen fails)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Buffer sizes must be set before listen() to take effect for accepted connections
+        configure_listen_socket(sock)
+        sock.settimeout(timeout)
+        sock.bind((host, port))
+        sock.listen(1)
+    except Exception:
+        sock.close()
+        raise
+    return sock
+
+
+def configure_client_socket(sock: socket.socket):
+    """Tune an accepted connection: no Nagle delay, immediate ACKs, keepalive to detect a dead base board"""
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except OSError:
+        pass
+    enable_quickack(sock)
+
+
+def enable_quickack(sock: socket.socket):
+    """Ask the kernel to ACK the next incoming data immediately (Linux only, not sticky)"""
+    if hasattr(socket, 'TCP_QUICKACK'):
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        except OSError:
+            pass
+
+
+@functools.lru_cache(maxsize=2)
+def format_local_time(seconds: int) -> str:
+    """Format whole epoch seconds as local 'YYYY-MM-DD HH:MM:SS' (cached, so once per second)"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(seconds))
+
+
+@functools.lru_cache(maxsize=64)
+def encode_command(command: str) -> bytes:
+    """UTF-8 bytes of a command (cached; the same commands tend to be sent repeatedly)"""
+    return command.encode('utf-8')
+
+
+@functools.lru_cache(maxsize=2)
+def _iso_local_second(seconds: int) -> str:
+    """Local 'YYYY-MM-DDTHH:MM:SS' for whole epoch seconds (cached, so once per second)"""
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(seconds))
+
+
+@functools.lru_cache(maxsize=16)
+def clock_part(timestamp: str) -> str:
+    """'HH:MM:SS' part of an ISO timestamp (cached: the same recent samples are shown on every refresh)"""
+    if 'T' not in timestamp:
+        return timestamp
+    return timestamp.split('T')[1].split('.')[0]
+
+
+def status_icon(status: str) -> str:
+    """Icon for a device status: ✓ for active (any case), ✗ otherwise"""
+    icon = _STATUS_ICONS.get(status)
+    if icon is None:
+        icon = '✓' if status.lower() == 'active' else '✗'
+    return icon
+
+
+def iso_timestamp() -> str:
+    """Current local time in ISO 8601 with microseconds, like datetime.now().isoformat()"""
+    now = time.time()
+    seconds = int(now)
+    return f"{_iso_local_second(seconds)}.{int((now - seconds) * 1000000):06d}"
+
+
+def parse_single_reading(data: bytes) -> Optional[dict]:
+    """Parse a one-device sensor message without the generic JSON parser; None for any other shape"""
+    match = _SINGLE_READING_RE.fullmatch(data)
+    if match is None:
+        return None
+    device_id, value = match.groups()
+    try:
+        device_id = device_id.decode('utf-8')
+        try:
+            return {device_id: float(value)}
+        except ValueError:
+            return {device_id: value.decode('utf-8')}
+    except UnicodeDecodeError:
+        return None  # Let the JSON parser report it
+
+
+def _strip_invalid_utf8(data: bytes) -> Optional[bytes]:
+    """Message bytes with undecodable sequences dropped (as decode(errors='ignore') does); None if already valid UTF-8"""
+    try:
+        data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('utf-8', errors='ignore').encode('utf-8')
+    return None
+
+
+class ConnectionState:
+    """Receive state of a base board connection, allocated once per listener and reused across reconnects"""
+    
+    BUFFER_SIZE = 128 * 1024  # Fits the largest frame (4 + 65535 bytes) with room to spare
+    
+    def __init__(self, buf_size: int = BUFFER_SIZE):
+        self.buffer = bytearray(buf_size)
+        self.head = 0  # Start of the bytes not processed yet
+        self.tail = 0  # End of the bytes received so far
+    
+    def reset(self):
+        """Forget buffered bytes for a new connection (the buffer itself is kept)"""
+        self.head = self.tail = 0
+    
+    def receive(self, sock: socket.socket) -> int:
+        """Append whatever sock has queued at the tail; returns the byte count (0 on EOF)"""
+        if self.tail == len(self.buffer):
+            self.compact()
+        with memoryview(self.buffer) as view:
+            n = sock.recv_into(view[self.tail:])
+        self.tail += n
+        return n
+    
+    def messages(self):
+        """Yield (data, is_raw) for every complete message buffered, then release the processed bytes"""
+        buf = self.buffer
+        with memoryview(buf) as view:
+            while self.head < self.tail:
+                available = self.tail - self.head
+                # A length prefix (< 64KB) starts with two zero bytes; anything else is raw text
+                if buf[self.head] == 0 and (available < 2 or buf[self.head + 1] == 0):
+                    if available < 4:
+                        break  # Rest of the length prefix not received yet
+                    (data_length,) = _LEN.unpack_from(buf, self.head)
+                    frame_end = self.head + 4 + data_length
+                    if frame_end > self.tail:
+                        break  # Rest of the message not received yet
+                    data = bytes(view[self.head + 4:frame_end])
+                    self.head = frame_end
+                    if data:
+                        yield data, False
+                    continue
+                
+                # Raw text (for testing with PuTTY/Tera Term): everything buffered is one message
+                data = bytes(view[self.head:self.tail]).strip()
+                self.head = self.tail
+                if data:
+                    yield data, True
+        self.release_processed()
+    
+    def release_processed(self):
+        """Rewind when drained; only move leftover bytes once they sit past the middle"""
+        if self.head == self.tail:
+            self.head = self.tail = 0
+        elif self.head > len(self.buffer) // 2:
+            self.compact()
+    
+    def compact(self):
+        """Move the unprocessed bytes to the start of the buffer"""
+        pending = self.tail - self.head
+        self.buffer[:pending] = self.buffer[self.head:self.tail]
+        self.head, self.tail = 0, pending
+
+
+class SocketWaiter:
+    """Blocks a server thread until its socket is readable or another thread calls wake()
+    
+    Only the socket being waited on (the listening socket while idle, the client once
+    connected) is registered next to a wake-up socket pair. A socketpair rather than a
+    pipe keeps this working with the select()-based selector on Windows.
+    """
+    
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()  # epoll on Linux
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._watched: Optional[socket.socket] = None  # Socket currently registered with the selector
+    
+    def wait(self, sock: Optional[socket.socket], timeout: Optional[float] = None) -> bool:
+        """Wait until sock is readable or wake() is called; returns whether sock is readable"""
+        if sock is not self._watched:
+            if self._watched is not None:
+                self._selector.unregister(self._watched)
+                self._watched = None
+            if sock is not None:
+                self._selector.register(sock, selectors.EVENT_READ)
+                self._watched = sock
+        if sock is None and timeout is None:
+            timeout = 0.1  # Nothing to wait on yet, just pace the caller's loop
+        
+        readable = False
+        for key, _ in self._selector.select(timeout):
+            if key.fileobj is self._wake_r:
+                try:
+                    while self._wake_r.recv(4096):
+                        pass
+                except OSError:
+                    pass  # Drained
+            else:
+                readable = True
+        return readable
+    
+    def wake(self):
+        """Make a pending or the next wait() return (safe to call from any thread)"""
+        try:
+            self._wake_w.send(b'\0')
+        except OSError:
+            pass  # A wake-up is already pending, or the waiter was closed
+    
+    def close(self):
+        """Release the selector and the wake-up sockets"""
+        self._selector.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+
 class NodeUpdateThread(threading.Thread):
     """Thread 1: Server socket - synchronously receives node update data from base board"""
     
@@ -71,262 +424,232 @@ class NodeUpdateThread(threading.Thread):
         self.running = False
         self.connected = False
         self.lock = threading.Lock()
+        self._conn_state = ConnectionState()  # Receive buffer, reused for every message
+        self._waiter = SocketWaiter()
+        self.ready = threading.Event()  # Set once startup has bound the listening socket (or failed to)
         
-        # Data storage
-        self.connected_devices: Dict[str, str] = {}  # device_id: status (active/deactive)
-        self.broadcast_node_list: List[str] = []  # List of available broadcast nodes
+        # Data storage: (connected devices {device_id: status (active/deactive)}, broadcast nodes).
+        # Read-only views replaced as a whole on every update, so readers can use them without
+        # the lock and without copying
+        self._snapshot: Tuple[Mapping[str, str], Tuple[str, ...]] = (MappingProxyType({}), ())
         
     def run(self):
         """Main thread execution loop - server mode"""
         self.running = True
-        print(f"[Node Update] Starting node update server socket thread")
-        print(f"[Node Update] Listening on {self.host}:{self.port}")
+        logger.info(f"[Node Update] Starting node update server socket thread")
+        logger.info(f"[Node Update] Listening on {self.host}:{self.port}")
         
         # Create server socket
         if not self.sock:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.sock.settimeout(self.timeout)
-            
             try:
-                self.sock.bind((self.host, self.port))
-                self.sock.listen(1)
-                print(f"[Node Update] Server listening on {self.host}:{self.port}")
+                self.sock = create_listen_socket(self.host, self.port, self.timeout)
+                logger.info(f"[Node Update] Server listening on {self.host}:{self.port}")
             except Exception as e:
-                print(f"[Node Update] Bind error: {e}")
-                if self.sock:
-                    self.sock.close()
+                logger.info(f"[Node Update] Bind error: {e}")
                 self.sock = None
+                self.ready.set()
+                self._waiter.close()
                 return
+        self.ready.set()
         
         # Check if server socket was created successfully
         if not self.sock:
-            print(f"[Node Update] Server socket not initialized, thread stopping")
+            logger.info(f"[Node Update] Server socket not initialized, thread stopping")
+            self._waiter.close()
             return
         
         while self.running:
             try:
+                # Sleep in the selector until there is something to do: a pending
+                # connection while idle, incoming data once connected, or stop()
+                if not self._waiter.wait(self.client_sock if self.connected else self.sock):
+                    continue
+                
                 # Accept connection from base board
                 if not self.connected:
                     try:
                         self.client_sock, addr = self.sock.accept()
                         self.connected = True
                         self.client_sock.settimeout(self.timeout)
-                        print(f"[Node Update] Base board connected from {addr}")
+                        configure_client_socket(self.client_sock)
+                        self._conn_state.reset()
+                        logger.info(f"[Node Update] Base board connected from {addr}")
                     except socket.timeout:
                         # Timeout is normal when waiting for connections
                         continue
                     except Exception as e:
-                        print(f"[Node Update] Accept error: {e}")
+                        logger.info(f"[Node Update] Accept error: {e}")
                         if self.running:
                             time.sleep(1)
                         continue
+                    # Wait for the first data in the selector
+                    continue
                 
                 # Only process if we have a connected client
                 if not self.client_sock or not self.connected:
                     time.sleep(0.1)
                     continue
                 
-                # Synchronous blocking receive from client
+                # Synchronous receive from client (the selector reported it readable)
                 try:
-                    # Try to receive with length prefix first, fallback to raw text
-                    # Peek at first 4 bytes to determine protocol
                     if not self.client_sock:
                         continue
-                    self.client_sock.settimeout(0.5)
-                    try:
-                        peek_data = self.client_sock.recv(4, socket.MSG_PEEK)
-                        if len(peek_data) == 4:
-                            # Check if first 4 bytes look like a length prefix (reasonable size)
-                            try:
-                                potential_length = int.from_bytes(peek_data, byteorder='big')
-                                # If it's a reasonable length (less than 64KB), try length-prefixed
-                                if 0 < potential_length < 65536:
-                                    # Consume the 4 bytes we peeked
-                                    length_data = self.client_sock.recv(4)
-                                    data_length = potential_length
-                                    
-                                    # Receive actual data
-                                    received = 0
-                                    data_parts = []
-                                    while received < data_length:
-                                        chunk = self.client_sock.recv(min(4096, data_length - received))
-                                        if not chunk:
-                                            raise ConnectionError("Connection closed during data receive")
-                                        data_parts.append(chunk)
-                                        received += len(chunk)
-                                    
-                                    data = b''.join(data_parts)
-                                    self._process_node_update(data.decode('utf-8', errors='ignore'))
-                                    self.client_sock.settimeout(self.timeout)
-                                    continue
-                            except (ValueError, OverflowError):
-                                # Not a valid length, treat as raw text
-                                pass
-                    except socket.timeout:
-                        # No data available yet
-                        self.client_sock.settimeout(self.timeout)
-                        continue
-                    
-                    # Fallback: Receive raw text (for testing with PuTTY/Tera Term)
-                    self.client_sock.settimeout(self.timeout)
-                    raw_data = self.client_sock.recv(4096)
-                    if not raw_data:
+                    # Append whatever is queued at the tail of the buffer, then
+                    # process every complete message it now holds
+                    if not self._conn_state.receive(self.client_sock):
                         raise ConnectionError("Connection closed")
-                    
-                    # Decode and process
-                    data = raw_data.decode('utf-8', errors='ignore').strip()
-                    if data:
-                        print(f"[Node Update] Received raw text data (length: {len(data)} bytes)")
+                    for data, is_raw in self._conn_state.messages():
+                        if is_raw and logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"[Node Update] Received raw text data (length: {len(data)} bytes)")
                         self._process_node_update(data)
                     
                 except socket.timeout:
                     # Timeout is acceptable, continue waiting
                     pass
                 except Exception as e:
-                    print(f"[Node Update] Receive error: {e}")
+                    logger.info(f"[Node Update] Receive error: {e}")
                     self.connected = False
-                    if self.client_sock:
-                        try:
-                            self.client_sock.close()
-                        except:
-                            pass
-                        self.client_sock = None
+                    _safe_close(self.client_sock)
+                    self.client_sock = None
                     if self.running:
                         time.sleep(1)
                         
             except Exception as e:
-                print(f"[Node Update] Error: {e}")
+                logger.info(f"[Node Update] Error: {e}")
                 self.connected = False
-                if self.client_sock:
-                    try:
-                        self.client_sock.close()
-                    except:
-                        pass
-                    self.client_sock = None
+                _safe_close(self.client_sock)
+                self.client_sock = None
                 if self.running:
                     time.sleep(1)
         
         # Cleanup
-        if self.client_sock:
-            try:
-                self.client_sock.close()
-            except:
-                pass
-        if self.sock:
-            try:
-                self.sock.close()
-            except:
-                pass
-        print(f"[Node Update] Thread stopped")
+        _safe_close(self.client_sock)
+        _safe_close(self.sock)
+        self._waiter.close()
+        logger.info(f"[Node Update] Thread stopped")
     
-    def _process_node_update(self, data: str):
-        """Process received node update data"""
+    def _process_node_update(self, data: bytes):
+        """Process received node update data (raw UTF-8 bytes)"""
         try:
             # Try to parse as JSON
-            update_data = json.loads(data)
+            update_data = _json.loads(data)
             
             # Validate data structure
             if not isinstance(update_data, dict):
                 raise ValueError("JSON root must be an object")
             
+            # The lock only serializes writers; readers use the published snapshot
             with self.lock:
+                devices, nodes = self._snapshot
+                
                 # Update connected devices
                 if 'devices' in update_data:
                     if isinstance(update_data['devices'], dict):
-                        self.connected_devices = update_data['devices']
+                        devices = MappingProxyType(update_data['devices'])
                     else:
-                        print(f"[Node Update] Warning: 'devices' should be an object, got {type(update_data['devices'])}")
+                        logger.info(f"[Node Update] Warning: 'devices' should be an object, got {type(update_data['devices'])}")
                 
                 # Update broadcast node list
                 if 'broadcast_nodes' in update_data:
                     if isinstance(update_data['broadcast_nodes'], list):
                         # Ensure all items are strings
-                        self.broadcast_node_list = [str(node) for node in update_data['broadcast_nodes']]
+                        nodes = tuple(str(node) for node in update_data['broadcast_nodes'])
                     elif isinstance(update_data['broadcast_nodes'], dict):
                         # Convert dict to list of keys (for compatibility)
-                        print(f"[Node Update] Warning: 'broadcast_nodes' should be a list, converting dict keys to list")
-                        self.broadcast_node_list = list(update_data['broadcast_nodes'].keys())
+                        logger.info(f"[Node Update] Warning: 'broadcast_nodes' should be a list, converting dict keys to list")
+                        nodes = tuple(update_data['broadcast_nodes'].keys())
                     else:
-                        print(f"[Node Update] Warning: 'broadcast_nodes' should be a list, got {type(update_data['broadcast_nodes'])}")
+                        logger.info(f"[Node Update] Warning: 'broadcast_nodes' should be a list, got {type(update_data['broadcast_nodes'])}")
+                
+                # Publish both with a single attribute store
+                self._snapshot = (devices, nodes)
             
             # Display update
             self._display_node_update()
             
-        except json.JSONDecodeError as e:
-            print(f"[Node Update] JSON decode error: {e}")
-            print(f"[Node Update] Invalid JSON at line {e.lineno}, column {e.colno}")
-            print(f"[Node Update] Received data: {data[:200]}...")
+        except (_json.JSONDecodeError, UnicodeDecodeError) as e:
+            # Invalid UTF-8 fails the parser; handle the message again without the undecodable bytes
+            cleaned = _strip_invalid_utf8(data)
+            if cleaned is not None:
+                self._process_node_update(cleaned)
+                return
+            logger.info(f"[Node Update] JSON decode error: {e}")
+            if isinstance(e, _json.JSONDecodeError):
+                logger.info(f"[Node Update] Invalid JSON at line {e.lineno}, column {e.colno}")
+            logger.info(f"[Node Update] Received data: {data[:200].decode('utf-8', errors='ignore')}...")
             # If not JSON, try to parse as simple format
             # Format: "device1:active,device2:deactive|node1,node2,node3"
             try:
-                parts = data.split('|')
-                if len(parts) >= 1:
-                    devices_str = parts[0]
-                    devices = {}
-                    for device_entry in devices_str.split(','):
-                        if ':' in device_entry:
-                            device_id, status = device_entry.split(':', 1)
-                            devices[device_id.strip()] = status.strip()
-                    with self.lock:
-                        self.connected_devices = devices
+                # Anything after a second '|' is ignored, so don't split it up
+                parts = data.split(b'|', 2)
+                devices = MappingProxyType({key.decode('utf-8', errors='ignore'): value.decode('utf-8', errors='ignore')
+                                            for key, value in _KV_RE.findall(parts[0])})
                 
+                nodes = None
                 if len(parts) >= 2:
-                    nodes = [n.strip() for n in parts[1].split(',') if n.strip()]
-                    with self.lock:
-                        self.broadcast_node_list = nodes
+                    nodes = tuple(n.decode('utf-8', errors='ignore')
+                                  for n in map(bytes.strip, parts[1].split(b',')) if n)
+                
+                with self.lock:
+                    self._snapshot = (devices, self._snapshot[1] if nodes is None else nodes)
                 
                 self._display_node_update()
             except Exception as e2:
-                print(f"[Node Update] Parse error: {e2}")
-                print(f"[Node Update] Raw data: {data}")
+                logger.info(f"[Node Update] Parse error: {e2}")
+                logger.info(f"[Node Update] Raw data: {data.decode('utf-8', errors='ignore')}")
         except Exception as e:
-            print(f"[Node Update] Processing error: {e}")
-            print(f"[Node Update] Raw data: {data[:200]}...")
+            logger.info(f"[Node Update] Processing error: {e}")
+            logger.info(f"[Node Update] Raw data: {data[:200].decode('utf-8', errors='ignore')}...")
     
     def _display_node_update(self):
         """Display current node update information"""
-        with self.lock:
-            print("\n" + "=" * 60)
-            print(f"[Node Update] Update received at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print("-" * 60)
-            print("Connected Devices:")
-            if self.connected_devices:
-                for device_id, status in self.connected_devices.items():
-                    status_icon = "✓" if status.lower() == "active" else "✗"
-                    print(f"  {status_icon} {device_id}: {status}")
-            else:
-                print("  No devices connected")
-            
-            print("\nAvailable Broadcast Nodes:")
-            if self.broadcast_node_list:
-                for node in self.broadcast_node_list:
-                    print(f"  • {node}")
-            else:
-                print("  No broadcast nodes available")
-            print("=" * 60 + "\n")
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        received_at = format_local_time(int(time.time()))
+        devices, nodes = self._snapshot
+        
+        # Emitted as one record so the report is a single write and can't interleave with other output
+        lines = ["\n" + SEPARATOR,
+                 f"[Node Update] Update received at {received_at}",
+                 DIVIDER,
+                 "Connected Devices:"]
+        if devices:
+            lines.extend(f"  {status_icon(status)} {device_id}: {status}"
+                         for device_id, status in devices.items())
+        else:
+            lines.append("  No devices connected")
+        
+        lines.append("\nAvailable Broadcast Nodes:")
+        if nodes:
+            lines.extend(f"  • {node}" for node in nodes)
+        else:
+            lines.append("  No broadcast nodes available")
+        lines.append(SEPARATOR + "\n")
+        logger.info("\n".join(lines))
+    
+    @property
+    def connected_devices(self) -> Mapping[str, str]:
+        """Connected devices from the latest update (read-only device_id: status mapping)"""
+        return self._snapshot[0]
+    
+    @property
+    def broadcast_node_list(self) -> Tuple[str, ...]:
+        """Available broadcast nodes from the latest update"""
+        return self._snapshot[1]
     
-    def get_node_info(self) -> tuple:
-        """Get current node information (thread-safe)"""
-        with self.lock:
-            return (self.connected_devices.copy(), self.broadcast_node_list.copy())
+    def get_node_info(self) -> Tuple[Mapping[str, str], Tuple[str, ...]]:
+        """Get current node information as read-only (devices, nodes) (thread-safe, without locking)"""
+        return self._snapshot
     
     def stop(self):
         """Stop the thread gracefully"""
         self.running = False
         self.connected = False
-        if self.client_sock:
-            try:
-                self.client_sock.close()
-            except:
-                pass
-            self.client_sock = None
-        if self.sock:
-            try:
-                self.sock.close()
-            except:
-                pass
-            self.sock = None
+        self._waiter.wake()
+        _safe_close(self.client_sock)
+        self.client_sock = None
+        _safe_close(self.sock)
+        self.sock = None
 
 
 class CommandHandlerThread(threading.Thread):
@@ -344,56 +667,67 @@ class CommandHandlerThread(threading.Thread):
         self.connected = False
         self.base_board_connected = False
         self.lock = threading.Lock()
-        self.command_queue = deque()
-        self.command_lock = threading.Lock()
+        self.command_queue: queue.SimpleQueue = queue.SimpleQueue()  # Commands from shell input
         self.pending_command = None  # Store command waiting for response
+        self._waiter = SocketWaiter()  # Also woken by send_command()
+        self.ready = threading.Event()  # Set once startup has bound the listening socket (or failed to)
         
     def run(self):
         """Main thread execution loop - server mode"""
         self.running = True
-        print(f"[Command Handler] Starting command handler server socket thread")
-        print(f"[Command Handler] Listening on {self.host}:{self.port}")
+        logger.info(f"[Command Handler] Starting command handler server socket thread")
+        logger.info(f"[Command Handler] Listening on {self.host}:{self.port}")
         
         # Create server socket
         if not self.sock:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.sock.settimeout(self.timeout)
-            
             try:
-                self.sock.bind((self.host, self.port))
-                self.sock.listen(1)
-                print(f"[Command Handler] Server listening on {self.host}:{self.port}")
+                self.sock = create_listen_socket(self.host, self.port, self.timeout)
+                logger.info(f"[Command Handler] Server listening on {self.host}:{self.port}")
             except Exception as e:
-                print(f"[Command Handler] Bind error: {e}")
-                self.sock.close()
+                logger.info(f"[Command Handler] Bind error: {e}")
                 self.sock = None
+                self.ready.set()
+                self._waiter.close()
                 return
+        self.ready.set()
         
         # Check if server socket was created successfully
         if not self.sock:
-            print(f"[Command Handler] Server socket not initialized, thread stopping")
+            logger.info(f"[Command Handler] Server socket not initialized, thread stopping")
+            self._waiter.close()
             return
         
         while self.running:
             try:
+                # Sleep in the selector until there is something to do: a pending
+                # connection while idle, incoming data once connected, a queued
+                # command (send_command) or stop()
+                readable = self._waiter.wait(self.client_sock if self.connected else self.sock)
+                if not self.running:
+                    break
+                
                 # Accept connection from base board or terminal client
                 if not self.connected:
                     if not self.sock:
-                        print(f"[Command Handler] Server socket is None, cannot accept connections")
+                        logger.info(f"[Command Handler] Server socket is None, cannot accept connections")
                         time.sleep(1)
                         continue
+                    if not readable:
+                        continue
                     try:
                         self.client_sock, addr = self.sock.accept()
                         self.connected = True
                         if self.client_sock:
                             self.client_sock.settimeout(self.timeout)
-                            print(f"[Command Handler] Client connected from {addr}")
+                            configure_client_socket(self.client_sock)
+                            logger.info(f"[Command Handler] Client connected from {addr}")
+                        # Nothing received yet; send what was queued while disconnected
+                        readable = False
                     except socket.timeout:
                         # Timeout is normal when waiting for connections
                         continue
                     except Exception as e:
-                        print(f"[Command Handler] Accept error: {e}")
+                        logger.info(f"[Command Handler] Accept error: {e}")
                         if self.running:
                             time.sleep(1)
                         continue
@@ -403,37 +737,37 @@ class CommandHandlerThread(threading.Thread):
                     time.sleep(0.1)
                     continue
                 
-                # Check for incoming data from connected client
+                # Incoming data from connected client (the selector reported it readable)
                 # Distinguish between commands (from terminal) and responses (from base board)
-                try:
-                    if self.client_sock:
-                        self.client_sock.settimeout(0.1)  # Short timeout for non-blocking check
-                        raw_data = self.client_sock.recv(4096)
-                        if raw_data:
-                            data = raw_data.decode('utf-8', errors='ignore').strip()
-                            if data:
-                                # Check if this is a response (JSON with N_id, GN, etc.) or a command
-                                if self._is_command_response(data):
-                                    # This is a RESPONSE from base board - only display it, do NOT send back
-                                    print(f"[Command Handler] Received response from base board")
-                                    self._process_command_response(data)
-                                else:
-                                    # This is a COMMAND from terminal client - send to base board
-                                    print(f"[Command Handler] Received command from terminal: {data}")
-                                    self._send_raw_command(data)
-                        if self.client_sock:
-                            self.client_sock.settimeout(self.timeout)
-                except socket.timeout:
-                    # No data from client, continue
-                    if self.client_sock:
-                        self.client_sock.settimeout(self.timeout)
-                except Exception as e:
-                    print(f"[Command Handler] Error receiving from client: {e}")
-                    if self.client_sock:
-                        try:
-                            self.client_sock.settimeout(self.timeout)
-                        except:
-                            pass
+                if readable:
+                    try:
+                        raw_data = self.client_sock.recv(RECV_SIZE)
+                        if not raw_data:
+                            logger.info(f"[Command Handler] Client disconnected")
+                            self.connected = False
+                            _safe_close(self.client_sock)
+                            self.client_sock = None
+                            continue
+                        data = raw_data.decode('utf-8', errors='ignore').strip()
+                        if data:
+                            # Check if this is a response (JSON with N_id, GN, etc.) or a command
+                            if self._is_command_response(data):
+                                # This is a RESPONSE from base board - only display it, do NOT send back
+                                logger.info(f"[Command Handler] Received response from base board")
+                                self._process_command_response(data)
+                            else:
+                                # This is a COMMAND from terminal client - send to base board
+                                logger.info(f"[Command Handler] Received command from terminal: {data}")
+                                self._send_raw_command(data)
+                    except socket.timeout:
+                        pass
+                    except Exception as e:
+                        # Keeping a failed socket would make the selector report it ready forever
+                        logger.info(f"[Command Handler] Error receiving from client: {e}")
+                        self.connected = False
+                        _safe_close(self.client_sock)
+                        self.client_sock = None
+                        continue
                 
                 # Also check for responses from base board (if using same socket)
                 # Note: If terminal client and base board use the same connection,
@@ -441,65 +775,49 @@ class CommandHandlerThread(threading.Thread):
                 # For now, we handle responses in _send_raw_command after sending command
                 
                 # Process command queue (from shell input)
-                with self.command_lock:
-                    if self.command_queue and self.connected and self.client_sock:
-                        command = self.command_queue.popleft()
-                        # Send command from shell input as raw text
-                        self._send_raw_command(command)
-                    else:
-                        time.sleep(0.1)  # Small delay when no commands
+                while self.connected:
+                    try:
+                        command = self.command_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    # Send command from shell input as raw text
+                    self._send_raw_command(command)
                 
             except Exception as e:
-                print(f"[Command Handler] Error: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception(f"[Command Handler] Error: {e}")
                 self.connected = False
-                if self.client_sock:
-                    try:
-                        self.client_sock.close()
-                    except:
-                        pass
-                    self.client_sock = None
+                _safe_close(self.client_sock)
+                self.client_sock = None
                 if self.running:
                     time.sleep(1)
         
         # Cleanup
-        if self.client_sock:
-            try:
-                self.client_sock.close()
-            except:
-                pass
-        if self.sock:
-            try:
-                self.sock.close()
-            except:
-                pass
-        print(f"[Command Handler] Thread stopped")
+        _safe_close(self.client_sock)
+        _safe_close(self.sock)
+        self._waiter.close()
+        logger.info(f"[Command Handler] Thread stopped")
     
     def _send_raw_command(self, command: str):
         """Send command as raw text (as-is, no length prefix) to base board"""
         if not self.client_sock or not self.connected:
-            print(f"[Command Handler] Not connected, cannot send command")
+            logger.info(f"[Command Handler] Not connected, cannot send command")
             return
             
         try:
             # Send command as raw text (as-is, no length prefix) to base board
             # This allows commands like "CMD:REQ_CONN:21001A0012505037 5555" to be sent directly
-            command_bytes = command.encode('utf-8')
-            self.client_sock.sendall(command_bytes)
-            print(f"[Command Handler] Sent command to base board: {command}")
+            self.client_sock.sendall(encode_command(command), SEND_FLAGS)
+            # A response is expected, so ACK it without the delayed-ACK wait
+            enable_quickack(self.client_sock)
+            logger.info(f"[Command Handler] Sent command to base board: {command}")
             # Note: Response will be received in the main loop and handled by _is_command_response()
             # We do NOT wait for response here to avoid blocking
             
         except Exception as e:
-            print(f"[Command Handler] Error sending command: {e}")
+            logger.info(f"[Command Handler] Error sending command: {e}")
             self.connected = False
-            if self.client_sock:
-                try:
-                    self.client_sock.close()
-                except:
-                    pass
-                self.client_sock = None
+            _safe_close(self.client_sock)
+            self.client_sock = None
     
     def _is_command_response(self, data: str) -> bool:
         """Check if the received data is a command response (JSON with response fields)"""
@@ -524,9 +842,9 @@ class CommandHandlerThread(threading.Thread):
             response_data = json.loads(response)
             
             # Display formatted response
-            print("\n" + "=" * 60)
-            print("[Command Handler] Command Response Received:")
-            print("-" * 60)
+            logger.info("\n" + SEPARATOR)
+            logger.info("[Command Handler] Command Response Received:")
+            logger.info(DIVIDER)
             
             # Map field names to readable labels
             field_labels = {
@@ -545,33 +863,31 @@ class CommandHandlerThread(threading.Thread):
                 label = field_labels.get(key, key)
                 # Format value (remove extra spaces for GN field)
                 formatted_value = value.strip() if isinstance(value, str) else value
-                print(f"  {label:25} : {formatted_value}")
+                logger.info(f"  {label:25} : {formatted_value}")
             
-            print("=" * 60 + "\n")
+            logger.info(SEPARATOR + "\n")
             
         except json.JSONDecodeError:
             # Not JSON, display as raw text
-            print(f"[Command Handler] Response (raw text): {response}")
+            logger.info(f"[Command Handler] Response (raw text): {response}")
         except Exception as e:
-            print(f"[Command Handler] Error processing response: {e}")
-            print(f"[Command Handler] Raw response: {response}")
+            logger.info(f"[Command Handler] Error processing response: {e}")
+            logger.info(f"[Command Handler] Raw response: {response}")
     
     def send_command(self, command: str):
         """Add command to queue (thread-safe)"""
-        with self.command_lock:
-            self.command_queue.append(command)
-            print(f"[Command Handler] Command queued: {command}")
+        # Logged before the handler can pick the command up, so this line precedes its "Sent" line
+        logger.info(f"[Command Handler] Command queued: {command}")
+        self.command_queue.put(command)
+        self._waiter.wake()
     
     def stop(self):
         """Stop the thread gracefully"""
         self.running = False
         self.connected = False
-        if self.sock:
-            try:
-                self.sock.close()
-            except:
-                pass
-            self.sock = None
+        self._waiter.wake()
+        _safe_close(self.sock)
+        self.sock = None
 
 
 class RealTimeDataThread(threading.Thread):
@@ -586,9 +902,12 @@ class RealTimeDataThread(threading.Thread):
         self.client_sock: Optional[socket.socket] = None
         self.running = False
         self.connected = False
-        self.lock = threading.Lock()
+        self._conn_state = ConnectionState()  # Messages are parsed in place in its buffer
+        self._waiter = SocketWaiter()
+        self.ready = threading.Event()  # Set once startup has bound the listening socket (or failed to)
         
-        # Data storage - using deque for efficient append/pop
+        # Data storage - this thread is the only writer. deque's append, clear,
+        # len and C-level copies run under the GIL, so readers need no lock
         self.sensor_data_list = deque(maxlen=max_data_points)
         self.display_interval = 2.0  # Display every 2 seconds
         self.last_display_time = time.time()
@@ -596,362 +915,319 @@ class RealTimeDataThread(threading.Thread):
     def run(self):
         """Main thread execution loop - server mode"""
         self.running = True
-        print(f"[Real-time Data] Starting real-time data monitoring server socket thread")
-        print(f"[Real-time Data] Listening on {self.host}:{self.port}")
+        logger.info(f"[Real-time Data] Starting real-time data monitoring server socket thread")
+        logger.info(f"[Real-time Data] Listening on {self.host}:{self.port}")
         
         # Create server socket
         if not self.sock:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.sock.settimeout(self.timeout)
-            
             try:
-                self.sock.bind((self.host, self.port))
-                self.sock.listen(1)
-                print(f"[Real-time Data] Server listening on {self.host}:{self.port}")
+                self.sock = create_listen_socket(self.host, self.port, self.timeout)
+                logger.info(f"[Real-time Data] Server listening on {self.host}:{self.port}")
             except Exception as e:
-                print(f"[Real-time Data] Bind error: {e}")
-                if self.sock:
-                    self.sock.close()
+                logger.info(f"[Real-time Data] Bind error: {e}")
                 self.sock = None
+                self.ready.set()
+                self._waiter.close()
                 return
+        self.ready.set()
         
         # Check if server socket was created successfully
         if not self.sock:
-            print(f"[Real-time Data] Server socket not initialized, thread stopping")
+            logger.info(f"[Real-time Data] Server socket not initialized, thread stopping")
+            self._waiter.close()
             return
         
         while self.running:
             try:
+                # Sleep in the selector until there is something to do: a pending
+                # connection while idle, incoming data once connected, or stop()
+                if not self._waiter.wait(self.client_sock if self.connected else self.sock):
+                    continue
+                
                 # Accept connection from base board
                 if not self.connected:
                     try:
                         self.client_sock, addr = self.sock.accept()
                         self.connected = True
                         self.client_sock.settimeout(self.timeout)
-                        print(f"[Real-time Data] Base board connected from {addr}")
+                        configure_client_socket(self.client_sock)
+                        self._conn_state.reset()
+                        logger.info(f"[Real-time Data] Base board connected from {addr}")
                     except socket.timeout:
                         # Timeout is normal when waiting for connections
                         continue
                     except Exception as e:
-                        print(f"[Real-time Data] Accept error: {e}")
+                        logger.info(f"[Real-time Data] Accept error: {e}")
                         if self.running:
                             time.sleep(1)
                         continue
+                    # Wait for the first data in the selector
+                    continue
                 
                 # Only process if we have a connected client
                 if not self.client_sock or not self.connected:
                     time.sleep(0.1)
                     continue
                 
-                # Receive sensor data from client
+                # Receive sensor data from client (the selector reported it readable)
                 try:
-                    # Try to receive with length prefix first, fallback to raw text
-                    # Peek at first 4 bytes to determine protocol
                     if not self.client_sock:
                         continue
-                    self.client_sock.settimeout(0.5)
-                    try:
-                        peek_data = self.client_sock.recv(4, socket.MSG_PEEK)
-                        if len(peek_data) == 4:
-                            # Check if first 4 bytes look like a length prefix (reasonable size)
-                            try:
-                                potential_length = int.from_bytes(peek_data, byteorder='big')
-                                # If it's a reasonable length (less than 64KB), try length-prefixed
-                                if 0 < potential_length < 65536:
-                                    # Consume the 4 bytes we peeked
-                                    length_data = self.client_sock.recv(4)
-                                    data_length = potential_length
-                                    
-                                    # Receive actual data
-                                    received = 0
-                                    data_parts = []
-                                    while received < data_length:
-                                        chunk = self.client_sock.recv(min(4096, data_length - received))
-                                        if not chunk:
-                                            raise ConnectionError("Connection closed during data receive")
-                                        data_parts.append(chunk)
-                                        received += len(chunk)
-                                    
-                                    data = b''.join(data_parts)
-                                    self._process_sensor_data(data.decode('utf-8', errors='ignore'))
-                                    
-                                    # Display data periodically
-                                    current_time = time.time()
-                                    if current_time - self.last_display_time >= self.display_interval:
-                                        self._display_sensor_data()
-                                        self.last_display_time = current_time
-                                    
-                                    self.client_sock.settimeout(self.timeout)
-                                    continue
-                            except (ValueError, OverflowError):
-                                # Not a valid length, treat as raw text
-                                pass
-                    except socket.timeout:
-                        # No data available yet
-                        self.client_sock.settimeout(self.timeout)
-                        continue
-                    
-                    # Fallback: Receive raw text (for testing with PuTTY/Tera Term)
-                    self.client_sock.settimeout(self.timeout)
-                    raw_data = self.client_sock.recv(4096)
-                    if not raw_data:
+                    # Append whatever is queued at the tail of the buffer, then
+                    # process every complete message it now holds
+                    if not self._conn_state.receive(self.client_sock):
                         raise ConnectionError("Connection closed")
-                    
-                    # Decode and process
-                    data = raw_data.decode('utf-8', errors='ignore').strip()
-                    if data:
-                        print(f"[Real-time Data] Received raw text data (length: {len(data)} bytes)")
+                    for data, is_raw in self._conn_state.messages():
+                        if is_raw and logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"[Real-time Data] Received raw text data (length: {len(data)} bytes)")
                         self._process_sensor_data(data)
-                        
-                        # Display data periodically
-                        current_time = time.time()
-                        if current_time - self.last_display_time >= self.display_interval:
-                            self._display_sensor_data()
-                            self.last_display_time = current_time
+                    
+                    # Display data periodically
+                    current_time = time.time()
+                    if current_time - self.last_display_time >= self.display_interval:
+                        self._display_sensor_data()
+                        self.last_display_time = current_time
                     
                 except socket.timeout:
                     # Timeout is acceptable, continue waiting
                     pass
                 except Exception as e:
-                    print(f"[Real-time Data] Receive error: {e}")
+                    logger.info(f"[Real-time Data] Receive error: {e}")
                     self.connected = False
-                    if self.client_sock:
-                        try:
-                            self.client_sock.close()
-                        except:
-                            pass
-                        self.client_sock = None
+                    _safe_close(self.client_sock)
+                    self.client_sock = None
                     if self.running:
                         time.sleep(1)
                         
             except Exception as e:
-                print(f"[Real-time Data] Error: {e}")
+                logger.info(f"[Real-time Data] Error: {e}")
                 self.connected = False
-                if self.client_sock:
-                    try:
-                        self.client_sock.close()
-                    except:
-                        pass
-                    self.client_sock = None
+                _safe_close(self.client_sock)
+                self.client_sock = None
                 if self.running:
                     time.sleep(1)
         
         # Cleanup
-        if self.client_sock:
-            try:
-                self.client_sock.close()
-            except:
-                pass
-        if self.sock:
-            try:
-                self.sock.close()
-            except:
-                pass
-        print(f"[Real-time Data] Thread stopped")
+        _safe_close(self.client_sock)
+        _safe_close(self.sock)
+        self._waiter.close()
+        logger.info(f"[Real-time Data] Thread stopped")
     
-    def _process_sensor_data(self, data: str):
-        """Process received sensor data"""
+    def _process_sensor_data(self, data: bytes):
+        """Process received sensor data (raw UTF-8 bytes)"""
         try:
-            # Try to parse as JSON
-            sensor_data = json.loads(data)
-            
-            # Handle format: {"21001A0012505037":"1195.0"} or {"device_id": "value"}
-            # Convert string values to appropriate types (float if numeric)
-            processed_data = {}
-            for device_id, value in sensor_data.items():
-                # Try to convert value to float if it's a numeric string
-                if isinstance(value, str):
-                    try:
-                        # Try to convert to float
-                        processed_data[device_id] = float(value)
-                    except ValueError:
-                        # Keep as string if not numeric
-                        processed_data[device_id] = value
-                else:
+            # Most messages carry a single reading, which skips the generic JSON parse
+            processed_data = parse_single_reading(data)
+            if processed_data is None:
+                # Try to parse as JSON
+                sensor_data = _json.loads(data)
+                
+                # Handle format: {"21001A0012505037":"1195.0"} or {"device_id": "value"}
+                # Convert string values to appropriate types (float if numeric)
+                processed_data = {}
+                for device_id, value in sensor_data.items():
+                    # Numeric strings become floats; other strings and non-string values are kept
+                    if type(value) is str:
+                        try:
+                            value = float(value)
+                        except ValueError:
+                            pass
                     processed_data[device_id] = value
             
-            # Add timestamp
-            processed_data['timestamp'] = datetime.now().isoformat()
+            # Print immediate confirmation (formatted before the timestamp is added)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"[Real-time Data] Received data: {processed_data}")
             
-            with self.lock:
-                self.sensor_data_list.append(processed_data)
+            # Add timestamp
+            processed_data['timestamp'] = iso_timestamp()
             
-            # Print immediate confirmation
-            print(f"[Real-time Data] Received data: {json.dumps({k: v for k, v in processed_data.items() if k != 'timestamp'})}")
+            self.sensor_data_list.append(processed_data)
             
-        except json.JSONDecodeError as e:
+        except (_json.JSONDecodeError, UnicodeDecodeError):
+            # Invalid UTF-8 fails the parser; handle the message again without the undecodable bytes
+            cleaned = _strip_invalid_utf8(data)
+            if cleaned is not None:
+                self._process_sensor_data(cleaned)
+                return
             # If not JSON, try to parse as simple format
             # Format: "sensor1:value1,sensor2:value2,..."
             try:
                 sensor_dict = {}
-                for entry in data.split(','):
-                    if ':' in entry:
-                        sensor_name, value = entry.split(':', 1)
-                        try:
-                            sensor_dict[sensor_name.strip()] = float(value.strip())
-                        except ValueError:
-                            sensor_dict[sensor_name.strip()] = value.strip()
+                for sensor_name, value in _KV_RE.findall(data):
+                    sensor_name = sensor_name.decode('utf-8', errors='ignore')
+                    try:
+                        sensor_dict[sensor_name] = float(value)
+                    except ValueError:
+                        sensor_dict[sensor_name] = value.decode('utf-8', errors='ignore')
                 
-                sensor_dict['timestamp'] = datetime.now().isoformat()
+                sensor_dict['timestamp'] = iso_timestamp()
                 
-                with self.lock:
-                    self.sensor_data_list.append(sensor_dict)
+                self.sensor_data_list.append(sensor_dict)
                 
-                print(f"[Real-time Data] Received data (simple format): {sensor_dict}")
+                logger.info(f"[Real-time Data] Received data (simple format): {sensor_dict}")
                     
             except Exception as e:
-                print(f"[Real-time Data] Parse error: {e}")
-                print(f"[Real-time Data] Raw data: {data}")
+                logger.info(f"[Real-time Data] Parse error: {e}")
+                logger.info(f"[Real-time Data] Raw data: {data.decode('utf-8', errors='ignore')}")
         except Exception as e:
-            print(f"[Real-time Data] Processing error: {e}")
-            print(f"[Real-time Data] Raw data: {data[:200]}...")
+            logger.info(f"[Real-time Data] Processing error: {e}")
+            logger.info(f"[Real-time Data] Raw data: {data[:200].decode('utf-8', errors='ignore')}...")
     
     def _display_sensor_data(self):
         """Display recent sensor data"""
-        with self.lock:
-            if not self.sensor_data_list:
-                return
-            
-            print("\n" + "=" * 60)
-            print(f"[Real-time Data] Sensor Data Update - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print("-" * 60)
-            print(f"Total data points stored: {len(self.sensor_data_list)}")
-            print("\nMost Recent Data Points:")
-            
-            # Display last 5 data points
-            recent_data = list(self.sensor_data_list)[-5:]
-            for i, data in enumerate(recent_data, 1):
-                print(f"\n  Data Point {i}:")
-                # Display device ID and sensor value pairs
-                device_data = {k: v for k, v in data.items() if k != 'timestamp'}
-                if device_data:
-                    for device_id, sensor_value in device_data.items():
-                        # Format numeric values nicely
-                        if isinstance(sensor_value, float):
-                            print(f"    Device ID: {device_id}  |  Value: {sensor_value:.2f}")
-                        else:
-                            print(f"    Device ID: {device_id}  |  Value: {sensor_value}")
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        # Copy the last 5 data points before formatting them
+        total = len(self.sensor_data_list)
+        recent_data = list(itertools.islice(reversed(self.sensor_data_list), 5))[::-1]
+        if not recent_data:
+            return
+        updated_at = format_local_time(int(time.time()))
+        
+        # Emitted as one record, like the node update report
+        lines = ["\n" + SEPARATOR,
+                 f"[Real-time Data] Sensor Data Update - {updated_at}",
+                 DIVIDER,
+                 f"Total data points stored: {total}",
+                 "\nMost Recent Data Points:"]
+        
+        # Display last 5 data points
+        for i, data in enumerate(recent_data, 1):
+            lines.append(f"\n  Data Point {i}:")
+            # Display device ID and sensor value pairs
+            has_device_data = False
+            for device_id, sensor_value in data.items():
+                if device_id == 'timestamp':
+                    continue
+                has_device_data = True
+                # Format numeric values nicely
+                if isinstance(sensor_value, float):
+                    lines.append(f"    Device ID: {device_id}  |  Value: {sensor_value:.2f}")
                 else:
-                    print("    (No device data)")
-                
-                if 'timestamp' in data:
-                    # Extract just the time part for cleaner display
-                    try:
-                        time_str = data['timestamp'].split('T')[1].split('.')[0] if 'T' in data['timestamp'] else data['timestamp']
-                        print(f"    Time: {time_str}")
-                    except:
-                        print(f"    Time: {data['timestamp']}")
+                    lines.append(f"    Device ID: {device_id}  |  Value: {sensor_value}")
+            if not has_device_data:
+                lines.append("    (No device data)")
             
-            print("=" * 60 + "\n")
+            if 'timestamp' in data:
+                # Extract just the time part for cleaner display
+                try:
+                    time_str = clock_part(data['timestamp'])
+                except Exception:
+                    time_str = data['timestamp']
+                lines.append(f"    Time: {time_str}")
+        
+        lines.append(SEPARATOR + "\n")
+        logger.info("\n".join(lines))
     
     def get_sensor_data(self, count: int = None) -> List[Dict]:
         """Get sensor data (thread-safe)"""
-        with self.lock:
-            data_list = list(self.sensor_data_list)
-            if count:
-                return data_list[-count:]
-            return data_list.copy()
+        if count:
+            # Walk back from the newest entry instead of copying the whole buffer
+            return list(itertools.islice(reversed(self.sensor_data_list), count))[::-1]
+        return list(self.sensor_data_list)
     
     def clear_sensor_data(self):
         """Clear all sensor data (thread-safe)"""
-        with self.lock:
-            self.sensor_data_list.clear()
+        self.sensor_data_list.clear()
     
     def stop(self):
         """Stop the thread gracefully"""
         self.running = False
         self.connected = False
-        if self.client_sock:
-            try:
-                self.client_sock.close()
-            except:
-                pass
-            self.client_sock = None
-        if self.sock:
-            try:
-                self.sock.close()
-            except:
-                pass
-            self.sock = None
+        self._waiter.wake()
+        _safe_close(self.client_sock)
+        self.client_sock = None
+        _safe_close(self.sock)
+        self.sock = None
 
 
-class CommandInputThread(threading.Thread):
-    """Separate thread to handle command input from shell"""
+class CommandInputThread:
+    """Command input from shell - lines are read by SocketManager on the main thread"""
     
     def __init__(self, command_handler: CommandHandlerThread, node_update_thread=None, 
                  realtime_data_thread=None, manager=None):
-        super().__init__(name="CommandInputThread", daemon=True)
+        self.name = "CommandInputThread"
         self.command_handler = command_handler
         self.node_update_thread = node_update_thread
         self.realtime_data_thread = realtime_data_thread
         self.manager = manager
         self.running = False
-        
-    def run(self):
-        """Read commands from stdin"""
+    
+    def start(self):
+        """Start accepting commands"""
         self.running = True
         print("\n[Command Input] Ready to accept commands. Type 'help' for available commands.")
         print("[Command Input] Enter commands below:\n")
-        
+    
+    def prompt(self):
+        """Show the input prompt"""
+        sys.stdout.write("> ")
+        sys.stdout.flush()
+    
+    def run(self):
+        """Read commands from stdin (blocking, for stdin that can't be registered in a selector)"""
+        while self.running:
+            try:
+                self.handle_command(input("> "))
+            except (EOFError, KeyboardInterrupt):
+                # Handle Ctrl+D
+                break
+        self.running = False
+    
+    def handle_command(self, command: str):
+        """Execute one line of input"""
         try:
-            while self.running:
-                try:
-                    # Read command from stdin
-                    command = input("> ").strip()
-                    
-                    if not command:
-                        continue
-                    
-                    if command.lower() == 'help':
-                        self._show_help()
-                        continue
-                    
-                    if command.lower() == 'exit' or command.lower() == 'quit':
-                        print("[Command Input] Exiting...")
-                        # Signal manager to stop all threads
-                        if self.manager:
-                            self.manager.stop_all()
-                        break
-                    
-                    if command.lower() == 'status':
-                        self._show_status()
-                        continue
-                    
-                    # Send command to base board
-                    if self.command_handler.connected:
-                        self.command_handler.send_command(command)
-                    else:
-                        print("[Command Input] Error: Not connected to base board")
-                        
-                except EOFError:
-                    # Handle Ctrl+D
-                    break
-                except KeyboardInterrupt:
-                    break
-                except Exception as e:
-                    print(f"[Command Input] Error: {e}")
-                    
+            command = command.strip()
+            
+            if not command:
+                return
+            
+            if command.lower() == 'help':
+                self._show_help()
+                return
+            
+            if command.lower() == 'exit' or command.lower() == 'quit':
+                print("[Command Input] Exiting...")
+                self.running = False
+                # Signal manager to stop all threads
+                if self.manager:
+                    self.manager.stop_all()
+                return
+            
+            if command.lower() == 'status':
+                self._show_status()
+                return
+            
+            # Send command to base board
+            if self.command_handler.connected:
+                self.command_handler.send_command(command)
+            else:
+                print("[Command Input] Error: Not connected to base board")
+                
         except Exception as e:
-            print(f"[Command Input] Thread error: {e}")
-        
-        self.running = False
+            print(f"[Command Input] Error: {e}")
+    
+    def is_alive(self) -> bool:
+        """Whether commands are still being accepted (False after exit/quit or end of input)"""
+        return self.running
     
     def _show_help(self):
         """Display help information"""
-        print("\n" + "=" * 60)
-        print("Available Commands:")
-        print("  <command>     - Send command to base board")
-        print("  status        - Show connection status of all threads")
-        print("  help          - Show this help message")
-        print("  exit/quit     - Exit the application")
-        print("=" * 60 + "\n")
+        try:
+            out = sys.stdout.buffer
+        except AttributeError:
+            # Replaced stdout without a binary buffer (e.g. captured output)
+            print(HELP_TEXT)
+            return
+        sys.stdout.flush()  # Keep the order of text already written
+        out.write(_HELP_BYTES)
+        out.flush()
     
     def _show_status(self):
         """Show status of all threads and their data"""
-        print("\n" + "=" * 60)
+        print("\n" + SEPARATOR)
         print("Thread Status:")
-        print("-" * 60)
+        print(DIVIDER)
         
         # Node Update Thread Status
         if self.node_update_thread:
@@ -964,8 +1240,7 @@ class CommandInputThread(threading.Thread):
             if devices:
                 print("\n  Connected Devices:")
                 for device_id, status in devices.items():
-                    status_icon = "✓" if status.lower() == "active" else "✗"
-                    print(f"    {status_icon} {device_id}: {status}")
+                    print(f"    {status_icon(status)} {device_id}: {status}")
             else:
                 print("\n  Connected Devices: None")
             
@@ -1028,10 +1303,10 @@ class CommandInputThread(threading.Thread):
         else:
             print("\n  Real-time Data Thread: Not initialized")
         
-        print("=" * 60 + "\n")
+        print(SEPARATOR + "\n")
     
     def stop(self):
-        """Stop the thread"""
+        """Stop accepting commands"""
         self.running = False
 
 
@@ -1052,7 +1327,10 @@ class SocketManager:
         self.command_handler_thread: Optional[CommandHandlerThread] = None
         self.realtime_data_thread: Optional[RealTimeDataThread] = None
         self.command_input_thread: Optional[CommandInputThread] = None
+        self.log_listener: Optional[BlockingStopQueueListener] = None
         self.running = False
+        self._stdin_selector: Optional[selectors.BaseSelector] = None
+        self._stdin_pending = b""  # Input received after the last complete line
         
     def start_all(self, node_update_host: str, node_update_port: int,
                   command_handler_host: str, command_handler_port: int,
@@ -1060,6 +1338,10 @@ class SocketManager:
         """Start all threads"""
         self.running = True
         
+        # Write queued log output to stdout from a background thread
+        self.log_listener = BlockingStopQueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+        self.log_listener.start()
+        
         # Create and start threads
         self.node_update_thread = NodeUpdateThread(node_update_host, node_update_port)
         self.command_handler_thread = CommandHandlerThread(command_handler_host, command_handler_port)
@@ -1071,14 +1353,61 @@ class SocketManager:
             manager=self
         )
         
-        # Start threads
-        self.node_update_thread.start()
-        time.sleep(0.2)
-        self.command_handler_thread.start()
-        time.sleep(0.2)
-        self.realtime_data_thread.start()
-        time.sleep(0.2)
+        # Start threads, each once the previous one has its listening socket
+        for thread in (self.node_update_thread, self.command_handler_thread, self.realtime_data_thread):
+            thread.start()
+            thread.ready.wait(timeout=1.0)
         self.command_input_thread.start()
+        self._watch_stdin()
+        
+    def _watch_stdin(self):
+        """Register stdin for poll_input(), or fall back to a blocking reader thread"""
+        selector = None
+        if sys.platform != 'win32':  # select() only handles sockets on Windows
+            try:
+                selector = selectors.DefaultSelector()
+                selector.register(sys.stdin.fileno(), selectors.EVENT_READ)
+            except (AttributeError, ValueError, OSError):
+                # No stdin, or one epoll can't watch (e.g. a regular file)
+                if selector:
+                    selector.close()
+                selector = None
+        if selector:
+            self._stdin_selector = selector
+            self.command_input_thread.prompt()
+        else:
+            threading.Thread(target=self.command_input_thread.run, name="CommandInputThread",
+                             daemon=True).start()
+    
+    def poll_input(self, timeout: float):
+        """Wait up to timeout seconds for shell input and execute any complete lines"""
+        selector = self._stdin_selector
+        if not selector:
+            time.sleep(timeout)
+            return
+        if not selector.select(timeout):
+            return
+        
+        # Read what is available and split lines here, so nothing waits unseen in sys.stdin's buffer
+        data = os.read(sys.stdin.fileno(), 4096)
+        if not data:
+            # End of input (Ctrl+D); a last line without a newline is still a command
+            selector.close()
+            self._stdin_selector = None
+            pending, self._stdin_pending = self._stdin_pending, b""
+            if pending:
+                self.command_input_thread.handle_command(pending.decode('utf-8', errors='ignore'))
+            self.command_input_thread.running = False
+            return
+        lines = (self._stdin_pending + data).split(b"\n")
+        self._stdin_pending = lines.pop()
+        for line in lines:
+            if not self.command_input_thread.running:
+                return
+            self.command_input_thread.handle_command(line.decode('utf-8', errors='ignore'))
+        if lines and self.command_input_thread.running:
+            # Prompt again only once a line was completed, like input()
+            self.command_input_thread.prompt()
         
     def stop_all(self):
         """Stop all threads gracefully"""
@@ -1097,14 +1426,23 @@ class SocketManager:
         if self.realtime_data_thread:
             self.realtime_data_thread.stop()
         
+        if self._stdin_selector:
+            self._stdin_selector.close()
+            self._stdin_selector = None
+        
         # Wait for threads to finish
         threads = [self.node_update_thread, self.command_handler_thread, 
-                  self.realtime_data_thread, self.command_input_thread]
+                  self.realtime_data_thread]
         for thread in threads:
             if thread:
                 thread.join(timeout=2.0)
                 if thread.is_alive():
                     print(f"Warning: {thread.name} did not stop gracefully")
+        
+        # Flush remaining log output once the threads are done
+        if self.log_listener:
+            self.log_listener.stop()
+            self.log_listener = None
     
     def is_any_alive(self):
         """Check if any thread is still alive"""
@@ -1140,14 +1478,14 @@ def main():
     # Get local IP addresses for client connections
     local_ips = get_local_ip_addresses()
     
-    print("=" * 60)
+    print(SEPARATOR)
     print("Embedded Linux Socket Threading Application")
     print("iMX92 MCU - Server Sockets (Waiting for Base Board)")
-    print("=" * 60)
+    print(SEPARATOR)
     print(f"Thread 1 - Node Update Server: Listening on {NODE_UPDATE_HOST}:{NODE_UPDATE_PORT}")
     print(f"Thread 2 - Command Handler Server: Listening on {COMMAND_HANDLER_HOST}:{COMMAND_HANDLER_PORT}")
     print(f"Thread 3 - Real-time Data Server: Listening on {REALTIME_DATA_HOST}:{REALTIME_DATA_PORT}")
-    print("-" * 60)
+    print(DIVIDER)
     print("Client Connection Information:")
     print("  Use these IP addresses to connect from client software:")
     for ip, desc in local_ips:
@@ -1155,7 +1493,7 @@ def main():
         print(f"      - Node Update: {ip}:{NODE_UPDATE_PORT}")
         print(f"      - Command Handler: {ip}:{COMMAND_HANDLER_PORT}")
         print(f"      - Real-time Data: {ip}:{REALTIME_DATA_PORT}")
-    print("=" * 60)
+    print(SEPARATOR)
     
     # Start all threads
     manager.start_all(
@@ -1167,11 +1505,12 @@ def main():
     # Main loop - monitor threads
     try:
         while manager.running and manager.is_any_alive():
-            time.sleep(0.5)
-            # Check if command input thread stopped (user typed exit/quit)
+            # Shell commands are read and executed here, between thread checks
+            manager.poll_input(0.5)
+            # Check if command input stopped (user typed exit/quit, or end of input)
             if manager.command_input_thread and not manager.command_input_thread.is_alive():
                 if manager.running:
-                    print("\n[Main] Command input thread stopped, shutting down...")
+                    print("\n[Main] Command input stopped, shutting down...")
                     manager.stop_all()
                     break
     except KeyboardInterrupt:
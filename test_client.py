@@ -6,8 +6,12 @@ Tests the Node Update socket with proper data format
 
 import socket
 import json
+import struct
 import sys
 
+# 4-byte big-endian length prefix
+_LEN = struct.Struct('>I')
+
 def send_node_update(host='127.0.0.1', port=8001, use_length_prefix=False):
     """Send node update data to the server"""
     
@@ -36,9 +40,8 @@ def send_node_update(host='127.0.0.1', port=8001, use_length_prefix=False):
         if use_length_prefix:
             # Send with length prefix (4 bytes)
             data_bytes = json_data.encode('utf-8')
-            length_bytes = len(data_bytes).to_bytes(4, byteorder='big')
-            sock.sendall(length_bytes)
-            sock.sendall(data_bytes)
+            # Single write so the prefix is not sent as its own tiny segment
+            sock.sendall(_LEN.pack(len(data_bytes)) + data_bytes)
             print("Sent data with length prefix")
         else:
             # Send raw text (for testing)
@@ -76,9 +79,8 @@ def send_realtime_data(host='127.0.0.1', port=8003, use_length_prefix=False):
         if use_length_prefix:
             # Send with length prefix (4 bytes)
             data_bytes = json_data.encode('utf-8')
-            length_bytes = len(data_bytes).to_bytes(4, byteorder='big')
-            sock.sendall(length_bytes)
-            sock.sendall(data_bytes)
+            # Single write so the prefix is not sent as its own tiny segment
+            sock.sendall(_LEN.pack(len(data_bytes)) + data_bytes)
             print("Sent data with length prefix")
         else:
             # Send raw text (for testing)